@@ -0,0 +1,104 @@
+"""
+In-memory TTL cache for idempotent courier lookups (e.g. tracking polls).
+"""
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed TTL.
+    Concurrent misses for the same key are collapsed into a single computation.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Return the cached value for key, computing (and caching) it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            logger.debug(f"Cache HIT: {key}")
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            try:
+                # Another thread may have filled the entry while we waited
+                value = self.get(key, _MISSING)
+                if value is not _MISSING:
+                    logger.debug(f"Cache HIT: {key}")
+                    return value
+
+                logger.debug(f"Cache MISS: {key}")
+                value = compute()
+                if should_cache is None or should_cache(value):
+                    self.set(key, value)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+        return value
+
+
+def ttl_cached(
+    cache: TTLCache,
+    key: Callable[..., Hashable],
+    should_cache: Optional[Callable[[Any], bool]] = None,
+):
+    """Decorator caching a function's results in a TTLCache under key(*args, **kwargs)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache.get_or_compute(
+                key(*args, **kwargs), lambda: func(*args, **kwargs), should_cache
+            )
+        return wrapper
+    return decorator
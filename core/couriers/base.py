@@ -3,7 +3,9 @@ Abstract Base Class for all courier implementations.
 Defines the contract that all couriers must implement.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import Dict, Any, FrozenSet, List
 import logging
 
 from ..dtos import (
@@ -19,12 +21,37 @@ from ..enums import UnifiedStatus
 logger = logging.getLogger(__name__)
 
 
+def _required(*fields):
+    """Compile (attribute path, error message) pairs into (getter, message) pairs."""
+    return tuple((attrgetter(path), message) for path, message in fields)
+
+
 class CourierBase(ABC):
     """
     Abstract base courier class.
     All courier implementations must extend this class.
     """
 
+    # Provider name returned by get_provider_name(); set by each subclass so
+    # internal callers can read it without a method call.
+    _provider_name: str = ""
+
+    # Fields that must be non-empty on every shipment request.
+    # Subclasses can extend this tuple instead of overriding validation.
+    _REQUIRED_FIELDS = _required(
+        ("reference_number", "Reference number is required"),
+        ("sender.name", "Sender name is required"),
+        ("sender.address_line1", "Sender address is required"),
+        ("sender.city", "Sender city is required"),
+        ("sender.country", "Sender country is required"),
+        ("sender.phone", "Sender phone is required"),
+        ("recipient.name", "Recipient name is required"),
+        ("recipient.address_line1", "Recipient address is required"),
+        ("recipient.city", "Recipient city is required"),
+        ("recipient.country", "Recipient country is required"),
+        ("recipient.phone", "Recipient phone is required"),
+    )
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the courier with configuration.
@@ -35,6 +62,7 @@ class CourierBase(ABC):
         self.config = config
         self.is_initialized = False
         self._validate_config(config)
+        self._features: FrozenSet[str] = frozenset(self.get_supported_features())
         self.is_initialized = True
         logger.info(f"Courier {self.get_provider_name()} initialized successfully")
 
@@ -91,39 +119,26 @@ class CourierBase(ABC):
 
     def supports_feature(self, feature: str) -> bool:
         """Check if this courier supports a specific feature."""
-        return feature in self.get_supported_features()
+        return feature in self._features
+
+    def track_shipments_bulk(self, waybill_numbers: List[str], max_workers: int = 8) -> List[TrackingResponse]:
+        """
+        Track several shipments, overlapping the courier round trips.
+        Results are returned in the same order as the waybill numbers.
+        """
+        if len(waybill_numbers) <= 1:
+            return [self.track_shipment(waybill) for waybill in waybill_numbers]
+
+        workers = min(max_workers, len(waybill_numbers))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.track_shipment, waybill_numbers))
 
     def validate_shipment_request(self, request: ShipmentRequest) -> List[str]:
         """
         Validate a shipment request. Returns list of error messages.
         Override for courier-specific validation.
         """
-        errors = []
-
-        if not request.reference_number:
-            errors.append("Reference number is required")
-
-        if not request.sender.name:
-            errors.append("Sender name is required")
-        if not request.sender.address_line1:
-            errors.append("Sender address is required")
-        if not request.sender.city:
-            errors.append("Sender city is required")
-        if not request.sender.country:
-            errors.append("Sender country is required")
-        if not request.sender.phone:
-            errors.append("Sender phone is required")
-
-        if not request.recipient.name:
-            errors.append("Recipient name is required")
-        if not request.recipient.address_line1:
-            errors.append("Recipient address is required")
-        if not request.recipient.city:
-            errors.append("Recipient city is required")
-        if not request.recipient.country:
-            errors.append("Recipient country is required")
-        if not request.recipient.phone:
-            errors.append("Recipient phone is required")
+        errors = [message for getter, message in self._REQUIRED_FIELDS if not getter(request)]
 
         if not request.package.weight or request.package.weight <= 0:
             errors.append("Package weight must be greater than 0")
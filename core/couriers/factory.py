@@ -2,8 +2,11 @@
 Courier Factory - Registry pattern for courier instantiation.
 """
 import logging
+import sys
 from typing import Dict, Any, Type, Optional
 
+from django.conf import settings
+
 from .base import CourierBase
 from .smsa import SMSACourier
 from .mock import MockCourier
@@ -19,9 +22,11 @@ class CourierFactory:
     Uses registry pattern - couriers register themselves.
     """
 
+    # Provider keys are interned so lookups with interned names (e.g. the
+    # CourierProvider values) hit the identity fast path of dict key comparison.
     _registry: Dict[str, Type[CourierBase]] = {
-        CourierProvider.SMSA.value: SMSACourier,
-        CourierProvider.MOCK.value: MockCourier,
+        sys.intern(CourierProvider.SMSA.value): SMSACourier,
+        sys.intern(CourierProvider.MOCK.value): MockCourier,
     }
 
     _instances: Dict[str, CourierBase] = {}
@@ -29,7 +34,7 @@ class CourierFactory:
     @classmethod
     def register(cls, provider: str, courier_class: Type[CourierBase]) -> None:
         """Register a new courier class."""
-        cls._registry[provider.upper()] = courier_class
+        cls._registry[sys.intern(provider.upper())] = courier_class
         logger.info(f"Registered courier: {provider}")
 
     @classmethod
@@ -48,11 +53,15 @@ class CourierFactory:
         Raises:
             ValueError: If provider is not registered
         """
+        # Not interned: provider comes from user input (URL path), and
+        # interning every unknown name would keep it alive forever.
         provider_upper = provider.upper()
 
         # Return cached instance if available and no new config provided
-        if provider_upper in cls._instances and config is None:
-            return cls._instances[provider_upper]
+        if config is None:
+            instance = cls._instances.get(provider_upper)
+            if instance is not None:
+                return instance
 
         if provider_upper not in cls._registry:
             available = list(cls._registry.keys())
@@ -75,13 +84,12 @@ class CourierFactory:
     @classmethod
     def _get_default_config(cls, provider: str) -> Dict[str, Any]:
         """Get default configuration for a provider."""
-        from django.conf import settings
-
         if provider == CourierProvider.SMSA.value:
             return {
                 "api_key": getattr(settings, "SMSA_API_KEY", "mock-key"),
                 "base_url": getattr(settings, "SMSA_BASE_URL", "https://api.smsa.com"),
                 "mock_mode": getattr(settings, "SMSA_MOCK_MODE", True),
+                "warm_up": getattr(settings, "SMSA_WARM_UP", False),
             }
         elif provider == CourierProvider.MOCK.value:
             return {
@@ -132,8 +140,14 @@ class CourierFactory:
     @classmethod
     def supports_feature(cls, provider: str, feature: str) -> bool:
         """Check if a provider supports a specific feature."""
-        try:
-            courier = cls.get_courier(provider)
-            return courier.supports_feature(feature)
-        except (ValueError, Exception):
-            return False
+        provider_upper = provider.upper()
+        courier = cls._instances.get(provider_upper)
+        if courier is None:
+            if provider_upper not in cls._registry:
+                return False
+            try:
+                courier = cls.get_courier(provider_upper)
+            except ValueError:
+                # Invalid courier configuration
+                return False
+        return courier.supports_feature(feature)
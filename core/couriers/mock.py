@@ -2,6 +2,7 @@
 Mock Courier implementation for testing without real API credentials.
 """
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 import uuid
@@ -20,6 +21,21 @@ from ..enums import UnifiedStatus
 
 logger = logging.getLogger(__name__)
 
+_LABEL_URL_PREFIX = "https://mock-courier.example.com/labels/"
+_LABEL_URL_SUFFIX = ".pdf"
+_CURRENCY = "SAR"
+_FEATURES = ("cancellation", "cod", "insurance", "signature_required", "express", "tracking")
+
+# Upper bound on shipments kept in memory; least recently used are evicted.
+MAX_MOCK_SHIPMENTS = 10_000
+
+_STATUS_BY_VALUE: Dict[str, UnifiedStatus] = {s.value: s for s in UnifiedStatus}
+
+
+def _format_timestamp(d: datetime) -> str:
+    """Format as YYYYMMDDHHMMSS without going through strftime."""
+    return f"{d.year:04d}{d.month:02d}{d.day:02d}{d.hour:02d}{d.minute:02d}{d.second:02d}"
+
 
 class MockCourier(CourierBase):
     """
@@ -27,24 +43,23 @@ class MockCourier(CourierBase):
     Does not make real API calls - generates realistic mock responses.
     """
 
-    # In-memory storage for mock shipments
-    _shipments: Dict[str, Dict[str, Any]] = {}
+    # In-memory LRU storage for mock shipments
+    _shipments: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    _provider_name = "MOCK"
 
     def _validate_config(self, config: Dict[str, Any]) -> None:
         """Mock courier accepts any config."""
         pass
 
     def get_provider_name(self) -> str:
-        return "MOCK"
+        return self._provider_name
 
     def get_supported_features(self) -> List[str]:
-        return ["cancellation", "cod", "insurance", "signature_required", "express", "tracking"]
+        return list(_FEATURES)
 
     def map_status(self, raw_status: str) -> UnifiedStatus:
-        try:
-            return UnifiedStatus(raw_status.upper())
-        except ValueError:
-            return UnifiedStatus.EXCEPTION
+        return _STATUS_BY_VALUE.get(raw_status.upper(), UnifiedStatus.EXCEPTION)
 
     def create_shipment(self, request: ShipmentRequest) -> ShipmentResponse:
         """Create a mock shipment."""
@@ -55,21 +70,23 @@ class MockCourier(CourierBase):
                 waybill_number="",
                 tracking_number="",
                 reference_number=request.reference_number,
-                courier_provider=self.get_provider_name(),
+                courier_provider=self._provider_name,
                 errors=errors,
             )
 
+        now = datetime.now()
+
         # Generate mock waybill
-        waybill = f"MOCK{datetime.now().strftime('%Y%m%d%H%M%S')}{uuid.uuid4().hex[:4].upper()}"
+        waybill = f"MOCK{_format_timestamp(now)}{uuid.uuid4().hex[:4].upper()}"
 
         # Store in memory for tracking
         self._shipments[waybill] = {
             "request": request,
             "status": UnifiedStatus.CREATED.value,
-            "created_at": datetime.now(),
+            "created_at": now,
             "events": [
                 {
-                    "timestamp": datetime.now(),
+                    "timestamp": now,
                     "status": UnifiedStatus.CREATED.value,
                     "description": "Shipment created successfully",
                     "location": request.sender.city,
@@ -77,6 +94,9 @@ class MockCourier(CourierBase):
             ],
         }
 
+        if len(self._shipments) > MAX_MOCK_SHIPMENTS:
+            self._shipments.popitem(last=False)
+
         logger.info(f"Mock shipment created: {waybill}")
 
         return ShipmentResponse(
@@ -84,12 +104,12 @@ class MockCourier(CourierBase):
             waybill_number=waybill,
             tracking_number=waybill,
             reference_number=request.reference_number,
-            courier_provider=self.get_provider_name(),
+            courier_provider=self._provider_name,
             service_type="MOCK_EXPRESS",
-            estimated_delivery_date=datetime.now() + timedelta(days=3),
+            estimated_delivery_date=now + timedelta(days=3),
             cost=50.0,
-            currency="SAR",
-            label_url=f"https://mock-courier.example.com/labels/{waybill}.pdf",
+            currency=_CURRENCY,
+            label_url=_LABEL_URL_PREFIX + waybill + _LABEL_URL_SUFFIX,
             label_data="JVBERi0xLjQKMSAwIG9iago8PC9UeXBlL1BhZ2VzL0tpZHNbXC9Db3VudCAwPj4KZW5kb2Jq",  # Mock base64 PDF
             courier_data={"mock": True, "waybill": waybill},
         )
@@ -97,6 +117,7 @@ class MockCourier(CourierBase):
     def track_shipment(self, waybill_number: str) -> TrackingResponse:
         """Track a mock shipment."""
         shipment_data = self._shipments.get(waybill_number)
+        now = datetime.now()
 
         if not shipment_data:
             # Return a default tracking response for unknown waybills
@@ -106,24 +127,24 @@ class MockCourier(CourierBase):
                 tracking_number=waybill_number,
                 status=UnifiedStatus.IN_TRANSIT.value,
                 status_description="Package is in transit",
-                last_updated=datetime.now(),
+                last_updated=now,
                 events=[
                     TrackingEvent(
-                        timestamp=datetime.now() - timedelta(hours=2),
+                        timestamp=now - timedelta(hours=2),
                         status=UnifiedStatus.CREATED.value,
                         raw_status="CREATED",
                         description="Shipment created",
                         location="Riyadh",
                     ),
                     TrackingEvent(
-                        timestamp=datetime.now() - timedelta(hours=1),
+                        timestamp=now - timedelta(hours=1),
                         status=UnifiedStatus.PICKED_UP.value,
                         raw_status="PICKED_UP",
                         description="Package picked up by courier",
                         location="Riyadh Hub",
                     ),
                     TrackingEvent(
-                        timestamp=datetime.now(),
+                        timestamp=now,
                         status=UnifiedStatus.IN_TRANSIT.value,
                         raw_status="IN_TRANSIT",
                         description="Package in transit to destination",
@@ -133,6 +154,7 @@ class MockCourier(CourierBase):
             )
 
         # Use stored data
+        self._shipments.move_to_end(waybill_number)
         events = [
             TrackingEvent(
                 timestamp=evt["timestamp"],
@@ -150,7 +172,7 @@ class MockCourier(CourierBase):
             tracking_number=waybill_number,
             status=shipment_data["status"],
             status_description=f"Current status: {shipment_data['status']}",
-            last_updated=datetime.now(),
+            last_updated=now,
             events=events,
         )
 
@@ -170,7 +192,7 @@ class MockCourier(CourierBase):
             waybill_number=waybill_number,
             cancellation_id=f"CANCEL-{uuid.uuid4().hex[:8].upper()}",
             refund_amount=25.0,
-            currency="SAR",
+            currency=_CURRENCY,
         )
 
     def print_label(self, waybill_number: str) -> LabelResponse:
@@ -178,7 +200,7 @@ class MockCourier(CourierBase):
         return LabelResponse(
             success=True,
             waybill_number=waybill_number,
-            label_url=f"https://mock-courier.example.com/labels/{waybill_number}.pdf",
+            label_url=_LABEL_URL_PREFIX + waybill_number + _LABEL_URL_SUFFIX,
             label_data="JVBERi0xLjQKMSAwIG9iago8PC9UeXBlL1BhZ2VzL0tpZHNbXC9Db3VudCAwPj4KZW5kb2Jq",
             format="PDF",
         )
@@ -1,13 +1,18 @@
 """
 SMSA Courier implementation.
 """
+import hashlib
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from datetime import datetime
+from operator import attrgetter
+from xml.sax.saxutils import escape as _xml_escape
+import xml.etree.ElementTree as ET
 import requests
 
 from .base import CourierBase
-from ..http_client import HTTPClient
+from ..cache import TTLCache, ttl_cached
+from ..http_client import CircuitBreaker, HTTPClient
 from ..dtos import (
     ShipmentRequest,
     ShipmentResponse,
@@ -22,6 +27,130 @@ from ..enums import UnifiedStatus
 logger = logging.getLogger(__name__)
 
 
+# SOAP envelopes are static apart from the operation payload, so they are
+# assembled once at import time and only filled in per call. Dynamic values
+# are XML-escaped and the finished envelope is encoded to UTF-8 once.
+_SMSA_NS = "http://track.smsaexpress.com/secom/"
+
+_ENVELOPE_HEAD = (
+    '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" '
+    f'xmlns:ns="{_SMSA_NS}"><soap:Header/><soap:Body>'
+)
+_ENVELOPE_TAIL = "</soap:Body></soap:Envelope>"
+
+_LABEL_URL_PREFIX = "https://track.smsaexpress.com/getPDF.aspx?awb="
+_CURRENCY = "SAR"
+_FEATURES = ("cancellation", "cod", "insurance", "tracking")
+
+# Tracking results are polled repeatedly by UIs and webhooks; serve repeats
+# from memory for a short while instead of calling SMSA every time.
+TRACKING_CACHE_TTL = 30
+_tracking_cache = TTLCache(ttl=TRACKING_CACHE_TTL)
+
+
+def _tracking_cache_key(courier: "SMSACourier", waybill_number: str) -> Tuple[Any, str, str]:
+    # Scoped like the shared HTTP client, so couriers pointed at different
+    # endpoints or accounts never see each other's results.
+    return (courier._client_key, "track", waybill_number)
+
+
+def _format_ymd(d: datetime) -> str:
+    """Format as YYYY-MM-DD without going through strftime."""
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+
+def _field(path: str) -> Callable[[Any, ShipmentRequest], Any]:
+    getter = attrgetter(path)
+    return lambda courier, request: getter(request)
+
+
+# addShipPDF parameters (per Integration Guide), in wire order. Each entry
+# maps a SOAP tag to either a constant or a getter taking (courier, request).
+_ADD_SHIP_FIELDS: Tuple[Tuple[str, Any], ...] = (
+    ("passKey", lambda courier, request: courier.pass_key),
+    ("refNo", _field("reference_number")),
+    ("sentDate", lambda courier, request: _format_ymd(datetime.now())),
+    ("idNo", ""),
+    ("cName", _field("sender.name")),
+    ("cntry", _field("sender.country")),
+    ("cCity", _field("sender.city")),
+    ("cZip", _field("sender.postal_code")),
+    ("cPOBox", ""),
+    ("cMobile", _field("sender.phone")),
+    ("cTel1", ""),
+    ("cTel2", ""),
+    ("cAddr1", _field("sender.address_line1")),
+    ("cAddr2", _field("sender.address_line2")),
+    ("shipType", "DLV"),
+    ("PCs", 1),
+    ("cEmail", _field("sender.email")),
+    ("cCarrValue", ""),
+    ("cCarrCurr", ""),
+    ("codAmt", _field("cod_amount")),
+    ("weight", _field("package.weight")),
+    ("custVal", _field("package.value")),
+    ("custCurr", _field("cod_currency")),
+    ("insrAmt", _field("insurance_amount")),
+    ("inrCurr", _field("cod_currency")),
+    ("itemDesc", _field("package.description")),
+    ("sName", _field("recipient.name")),
+    ("sCntry", _field("recipient.country")),
+    ("sCity", _field("recipient.city")),
+    ("sZip", _field("recipient.postal_code")),
+    ("sPOBox", ""),
+    ("sMobile", _field("recipient.phone")),
+    ("sTel1", ""),
+    ("sTel2", ""),
+    ("sAddr1", _field("recipient.address_line1")),
+    ("sAddr2", _field("recipient.address_line2")),
+    ("sEmail", _field("recipient.email")),
+)
+
+
+def _compile_fields(
+    fields: Tuple[Tuple[str, Any], ...], head: str, tail: str
+) -> Tuple[Tuple[Tuple[str, Callable[[Any, ShipmentRequest], Any]], ...], str]:
+    """
+    Partially evaluate a field spec against its envelope.
+
+    Constant fields are rendered into the surrounding static markup, leaving
+    (static prefix, getter) pairs for the dynamic fields plus a static suffix.
+    """
+    parts = []
+    pending = head
+    for tag, value in fields:
+        if callable(value):
+            parts.append((f"{pending}<ns:{tag}>", value))
+            pending = f"</ns:{tag}>"
+        else:
+            pending += f"<ns:{tag}>{_xml_escape(str(value))}</ns:{tag}>"
+    return tuple(parts), pending + tail
+
+
+_ADD_SHIP_PARTS, _ADD_SHIP_SUFFIX = _compile_fields(
+    _ADD_SHIP_FIELDS, _ENVELOPE_HEAD + "<ns:addShipPDF>", "</ns:addShipPDF>" + _ENVELOPE_TAIL
+)
+
+_TRACK_TMPL = (
+    _ENVELOPE_HEAD
+    + "<ns:getTrackingParams>"
+    + "<ns:awbNo>{awb}</ns:awbNo>"
+    + "<ns:passKey>{key}</ns:passKey>"
+    + "</ns:getTrackingParams>"
+    + _ENVELOPE_TAIL
+)
+
+_CANCEL_TMPL = (
+    _ENVELOPE_HEAD
+    + "<ns:cancelShipment>"
+    + "<ns:awbNo>{awb}</ns:awbNo>"
+    + "<ns:passKey>{key}</ns:passKey>"
+    + "<ns:reas>{reason}</ns:reas>"
+    + "</ns:cancelShipment>"
+    + _ENVELOPE_TAIL
+)
+
+
 class SMSACourier(CourierBase):
     """
     SMSA Express courier implementation using SOAP API.
@@ -29,7 +158,14 @@ class SMSACourier(CourierBase):
     """
 
     # SOAP Namespace
-    NS = "http://track.smsaexpress.com/secom/"
+    NS = _SMSA_NS
+
+    _provider_name = "SMSA"
+
+    # Result tags, both namespace-qualified and bare (some SMSA endpoints
+    # answer without a default namespace on the result element).
+    _ADD_SHIP_RESULT_PATHS = (f".//{{{_SMSA_NS}}}addShipPDFResult", ".//addShipPDFResult")
+    _CANCEL_RESULT_PATHS = (f".//{{{_SMSA_NS}}}cancelShipmentResult", ".//cancelShipmentResult")
     
     STATUS_MAP: Dict[str, UnifiedStatus] = {
         "Data Received": UnifiedStatus.CREATED,
@@ -39,114 +175,89 @@ class SMSACourier(CourierBase):
         "Returned": UnifiedStatus.RETURNED,
         "Canceled": UnifiedStatus.CANCELLED,
     }
+    _STATUS_MAP_LOWER: Dict[str, UnifiedStatus] = {k.lower(): v for k, v in STATUS_MAP.items()}
+    # Exact-case and lower-case keys, so the common exact match skips lower()
+    _status_get = {**STATUS_MAP, **_STATUS_MAP_LOWER}.get
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.pass_key = config.get("api_key", "testing0")
         self.base_url = config.get("base_url", "https://track.smsaexpress.com/SECOM/SMSAwebService.asmx")
-        self.http_client = HTTPClient(
-            base_url="",  # We use full URL for SOAP
-            retries=3,
-            headers={"Content-Type": "text/xml; charset=utf-8"}
+        # The SOAP service lives on a single endpoint, so one client (and its
+        # keep-alive connection pool) is shared by every operation and by
+        # every courier instance using the same endpoint and credentials.
+        self._client_key = client_key = (
+            self._provider_name,
+            self.base_url,
+            hashlib.blake2s(str(self.pass_key).encode()).hexdigest(),
+        )
+        self.http_client = HTTPClient.shared(
+            client_key,
+            lambda: HTTPClient(
+                base_url=self.base_url,
+                retries=3,
+                headers={"Content-Type": "text/xml; charset=utf-8"},
+                pool_maxsize=config.get("pool_maxsize", 64),
+                timeout=config.get("timeout", 15.0),
+                circuit_breaker=CircuitBreaker(name=self._provider_name),
+            ),
         )
+        if config.get("warm_up"):
+            self.http_client.warm_up()
 
     def get_provider_name(self) -> str:
-        return "SMSA"
+        return self._provider_name
 
     def get_supported_features(self) -> List[str]:
-        return ["cancellation", "cod", "insurance", "tracking"]
+        return list(_FEATURES)
 
     def map_status(self, raw_status: str) -> UnifiedStatus:
-        # Simple fuzzy matching or direct lookup
-        for key, val in self.STATUS_MAP.items():
-            if key.lower() in raw_status.lower():
+        # Direct lookup first, fuzzy substring matching as fallback
+        status = self._status_get(raw_status)
+        if status is not None:
+            return status
+        raw_lower = raw_status.lower()
+        status = self._status_get(raw_lower)
+        if status is not None:
+            return status
+        for key, val in self._STATUS_MAP_LOWER.items():
+            if key in raw_lower:
                 return val
         return UnifiedStatus.IN_TRANSIT # Default fallthrough
 
+    @staticmethod
+    def _find_result_text(root: ET.Element, paths: Tuple[str, ...], default: Optional[str] = None) -> Optional[str]:
+        """Return the text of the first element matching one of the precompiled paths."""
+        for path in paths:
+            elem = root.find(path)
+            if elem is not None:
+                return elem.text
+        return default
+
     def create_shipment(self, request: ShipmentRequest) -> ShipmentResponse:
         self._ensure_initialized()
-        
-        # 1. Map DTO to SMSA Parameters (per Integration Guide)
-        params = {
-            "passKey": self.pass_key,
-            "refNo": request.reference_number,
-            "sentDate": datetime.now().strftime("%Y-%m-%d"),
-            "idNo": "",
-            "cName": request.sender.name,
-            "cntry": request.sender.country,
-            "cCity": request.sender.city,
-            "cZip": request.sender.postal_code,
-            "cPOBox": "",
-            "cMobile": request.sender.phone,
-            "cTel1": "",
-            "cTel2": "",
-            "cAddr1": request.sender.address_line1,
-            "cAddr2": request.sender.address_line2,
-            "shipType": "DLV",
-            "PCs": 1,
-            "cEmail": request.sender.email,
-            "cCarrValue": "",
-            "cCarrCurr": "",
-            "codAmt": request.cod_amount,
-            "weight": request.package.weight,
-            "custVal": request.package.value,
-            "custCurr": request.cod_currency,
-            "insrAmt": request.insurance_amount,
-            "inrCurr": request.cod_currency,
-            "itemDesc": request.package.description,
-            "sName": request.recipient.name,
-            "sCntry": request.recipient.country,
-            "sCity": request.recipient.city,
-            "sZip": request.recipient.postal_code,
-            "sPOBox": "",
-            "sMobile": request.recipient.phone,
-            "sTel1": "",
-            "sTel2": "",
-            "sAddr1": request.recipient.address_line1,
-            "sAddr2": request.recipient.address_line2,
-            "sEmail": request.recipient.email,
-        }
-
-        # 2. Build SOAP Envelope
-        soap_body = """
-        <soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" xmlns:ns="{ns}">
-           <soap:Header/>
-           <soap:Body>
-              <ns:addShipPDF>
-                 {fields}
-              </ns:addShipPDF>
-           </soap:Body>
-        </soap:Envelope>
-        """.format(
-            ns=self.NS,
-            fields="".join([f"<ns:{k}>{v}</ns:{k}>" for k, v in params.items()])
-        )
+
+        # 1. Map DTO to SMSA Parameters and build SOAP Envelope
+        soap_body = (
+            "".join([prefix + _xml_escape(str(get(self, request))) for prefix, get in _ADD_SHIP_PARTS])
+            + _ADD_SHIP_SUFFIX
+        ).encode("utf-8")
 
         try:
-            # 3. Send Request
+            # 2. Send Request
             response = self.http_client.post(
-                self.base_url, 
+                "",
                 data=soap_body,
                 headers={"SOAPAction": f"{self.NS}addShipPDF"}
             )
             response.raise_for_status()
 
-            # 4. Parse XML Response
+            # 3. Parse XML Response
             # Response: <addShipPDFResult>AWB#123</addShipPDFResult> (Simplified)
             # Actually, depending on success it might return "Failed" or the AWB.
             # Real SMSA returns the AWB directly in the result tag for success.
-            
-            # Simple string check for demo purposes as XML parsing can be brittle without lxml
-            # In a real scenario we'd use ElementTree
-            import xml.etree.ElementTree as ET
             root = ET.fromstring(response.content)
-            # Iterate to find result. Namespace handling in ET is verbose.
-            # We look for the tag ending in 'addShipPDFResult'
-            result_text = None
-            for elem in root.iter():
-                if elem.tag.endswith("addShipPDFResult"):
-                    result_text = elem.text
-                    break
+            result_text = self._find_result_text(root, self._ADD_SHIP_RESULT_PATHS)
             
             if not result_text or "Failed" in result_text:
                  return ShipmentResponse(
@@ -154,7 +265,7 @@ class SMSACourier(CourierBase):
                     waybill_number="",
                     tracking_number="",
                     reference_number=request.reference_number,
-                    courier_provider="SMSA",
+                    courier_provider=self._provider_name,
                     errors=[f"SMSA API Error: {result_text}"]
                 )
 
@@ -163,10 +274,10 @@ class SMSACourier(CourierBase):
                 waybill_number=result_text,
                 tracking_number=result_text,
                 reference_number=request.reference_number,
-                courier_provider="SMSA",
+                courier_provider=self._provider_name,
                 cost=0.0, # SMSA addShip doesn't return cost immediately in all versions
-                currency="SAR",
-                label_url=f"https://track.smsaexpress.com/getPDF.aspx?awb={result_text}", # Constructed URL
+                currency=_CURRENCY,
+                label_url=_LABEL_URL_PREFIX + result_text, # Constructed URL
                 label_data="", 
             )
 
@@ -177,28 +288,21 @@ class SMSACourier(CourierBase):
                 waybill_number="",
                 tracking_number="",
                 reference_number=request.reference_number,
-                courier_provider="SMSA",
+                courier_provider=self._provider_name,
                 errors=[str(e)]
             )
 
+    @ttl_cached(_tracking_cache, key=_tracking_cache_key, should_cache=lambda r: r.success)
     def track_shipment(self, waybill_number: str) -> TrackingResponse:
         self._ensure_initialized()
         
-        soap_body = """
-        <soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" xmlns:ns="{ns}">
-           <soap:Header/>
-           <soap:Body>
-              <ns:getTrackingParams>
-                 <ns:awbNo>{awb}</ns:awbNo>
-                 <ns:passKey>{key}</ns:passKey>
-              </ns:getTrackingParams>
-           </soap:Body>
-        </soap:Envelope>
-        """.format(ns=self.NS, awb=waybill_number, key=self.pass_key)
+        soap_body = _TRACK_TMPL.format(
+            awb=_xml_escape(waybill_number), key=_xml_escape(self.pass_key)
+        ).encode("utf-8")
 
         try:
             response = self.http_client.post(
-                self.base_url,
+                "",
                 data=soap_body,
                 headers={"SOAPAction": f"{self.NS}getTrackingParams"}
             )
@@ -231,41 +335,30 @@ class SMSACourier(CourierBase):
     def cancel_shipment(self, waybill_number: str, reason: str = "") -> CancelResponse:
         self._ensure_initialized()
         
-        soap_body = """
-        <soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" xmlns:ns="{ns}">
-           <soap:Header/>
-           <soap:Body>
-              <ns:cancelShipment>
-                 <ns:awbNo>{awb}</ns:awbNo>
-                 <ns:passKey>{key}</ns:passKey>
-                 <ns:reas>{reason}</ns:reas>
-              </ns:cancelShipment>
-           </soap:Body>
-        </soap:Envelope>
-        """.format(ns=self.NS, awb=waybill_number, key=self.pass_key, reason=reason)
+        soap_body = _CANCEL_TMPL.format(
+            awb=_xml_escape(waybill_number), key=_xml_escape(self.pass_key), reason=_xml_escape(reason)
+        ).encode("utf-8")
 
         try:
             response = self.http_client.post(
-                self.base_url,
+                "",
                 data=soap_body,
                 headers={"SOAPAction": f"{self.NS}cancelShipment"}
             )
             
             # Use ElementTree to check result
-            import xml.etree.ElementTree as ET
             root = ET.fromstring(response.content)
-            result_text = "Failed"
-            for elem in root.iter():
-                if elem.tag.endswith("cancelShipmentResult"):
-                    result_text = elem.text
-                    break
-            
+            result_text = self._find_result_text(root, self._CANCEL_RESULT_PATHS, default="Failed")
+            success = "Successfully" in (result_text or "")
+            if success:
+                _tracking_cache.delete(_tracking_cache_key(self, waybill_number))
+
             return CancelResponse(
-                success="Successfully" in (result_text or ""),
+                success=success,
                 waybill_number=waybill_number,
                 cancellation_id=result_text,
                 refund_amount=0,
-                currency="SAR"
+                currency=_CURRENCY
             )
         except Exception as e:
             return CancelResponse(
@@ -279,6 +372,6 @@ class SMSACourier(CourierBase):
          return LabelResponse(
             success=True,
             waybill_number=waybill_number,
-            label_url=f"https://track.smsaexpress.com/getPDF.aspx?awb={waybill_number}",
+            label_url=_LABEL_URL_PREFIX + waybill_number,
             label_data=""
         )
@@ -6,7 +6,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Address:
     """Address DTO."""
     name: str
@@ -21,6 +21,11 @@ class Address:
     po_box: str = ""
     phone2: str = ""
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Address":
+        """Build from a mapping; keys that are missing fall back to field defaults."""
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__ if name in data})
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "name": self.name,
@@ -37,7 +42,7 @@ class Address:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PackageDetails:
     """Package details DTO."""
     weight: float
@@ -48,6 +53,11 @@ class PackageDetails:
     value: float = 0.0
     pieces: int = 1
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PackageDetails":
+        """Build from a mapping; keys that are missing fall back to field defaults."""
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__ if name in data})
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "weight": self.weight,
@@ -60,7 +70,7 @@ class PackageDetails:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ShipmentRequest:
     """Unified shipment creation request."""
     reference_number: str
@@ -78,7 +88,7 @@ class ShipmentRequest:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ShipmentResponse:
     """Unified shipment creation response."""
     success: bool
@@ -97,7 +107,7 @@ class ShipmentResponse:
     courier_data: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class TrackingEvent:
     """Single tracking event."""
     timestamp: datetime
@@ -108,7 +118,7 @@ class TrackingEvent:
     raw_status: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class TrackingResponse:
     """Unified tracking response."""
     success: bool
@@ -123,7 +133,7 @@ class TrackingResponse:
     errors: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class CancelResponse:
     """Unified cancellation response."""
     success: bool
@@ -134,7 +144,7 @@ class CancelResponse:
     errors: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class LabelResponse:
     """Unified label response."""
     success: bool
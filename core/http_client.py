@@ -2,10 +2,110 @@
 HTTP Client with Retry logic.
 Satisfies the bonus requirement: "Add mechanisms for doing HTTP calls and doing HTTP retries."
 """
+import logging
+import random
+import threading
+import time
+from itertools import takewhile
+
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Hashable
+
+
+logger = logging.getLogger(__name__)
+
+
+class FullJitterRetry(Retry):
+    """
+    Retry policy using exponential backoff with full jitter.
+    Each sleep is drawn uniformly from [0, min(backoff_max, backoff_factor * 2^(n-1))],
+    so concurrent clients don't retry in synchronized waves.
+    """
+
+    def get_backoff_time(self) -> float:
+        # Only the last consecutive errors count (redirects are ignored).
+        consecutive_errors = len(
+            list(takewhile(lambda x: x.redirect_location is None, reversed(self.history)))
+        )
+        if consecutive_errors == 0:
+            return 0
+        ceiling = min(self.backoff_max, self.backoff_factor * (2 ** (consecutive_errors - 1)))
+        return random.uniform(0, ceiling)
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling a remote service whose circuit breaker is open."""
+
+
+class _ServerError(requests.HTTPError):
+    """5xx response, raised inside the circuit breaker so it counts as a failure."""
+
+
+class CircuitBreaker:
+    """
+    Fails fast after `failure_threshold` consecutive failures.
+    Once `recovery_timeout` seconds have passed a single trial call is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str = "", failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except requests.RequestException:
+            self._record_failure()
+            raise
+        except BaseException:
+            # Other errors don't count against the remote service, but a
+            # failed half-open trial must re-open the circuit or it stays stuck.
+            self._record_failure(trial_only=True)
+            raise
+        self._record_success()
+        return result
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self._set_state(self.HALF_OPEN)
+                return
+            raise CircuitOpenError(f"Circuit breaker {self.name!r} is open")
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def _record_failure(self, trial_only: bool = False) -> None:
+        with self._lock:
+            if trial_only and self.state != self.HALF_OPEN:
+                return
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                if self.state != self.OPEN:
+                    self._set_state(self.OPEN)
+
+    def _set_state(self, state: str) -> None:
+        logger.warning(f"Circuit breaker {self.name!r}: {self.state} -> {state}")
+        self.state = state
 
 
 class HTTPClient:
@@ -13,44 +113,113 @@ class HTTPClient:
     Wrapper around requests.Session with built-in retry logic.
     """
 
+    # Process-wide clients, see shared()
+    _shared: Dict[Hashable, "HTTPClient"] = {}
+    _shared_lock = threading.Lock()
+
     def __init__(
         self,
         base_url: str = "",
         retries: int = 3,
         backoff_factor: float = 0.3,
-        status_forcelist: tuple = (500, 502, 504),
+        status_forcelist: tuple = (429, 500, 502, 504),
         headers: Optional[Dict[str, Any]] = None,
+        max_delay: float = 30.0,
+        pool_maxsize: int = 64,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        timeout: Optional[float] = 15.0,
     ):
         self.base_url = base_url
+        # Default per-request timeout, so a hung server raises requests.Timeout
+        # (and trips the circuit breaker) instead of blocking forever.
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker
         self.session = requests.Session()
         
-        retry = Retry(
+        retry = FullJitterRetry(
             total=retries,
             read=retries,
             connect=retries,
             backoff_factor=backoff_factor,
+            backoff_max=max_delay,
             status_forcelist=status_forcelist,
+            respect_retry_after_header=True,
         )
         
-        adapter = HTTPAdapter(max_retries=retry)
+        # Keep enough pooled keep-alive connections per host for concurrent
+        # callers (e.g. bulk tracking) instead of requests' default of 10.
+        adapter = HTTPAdapter(
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+            pool_block=False,
+        )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
-        
+        self.session.headers["Connection"] = "keep-alive"
+
         if headers:
             self.session.headers.update(headers)
 
+    @classmethod
+    def shared(cls, key: Hashable, factory: Callable[[], "HTTPClient"]) -> "HTTPClient":
+        """
+        Return the process-wide client registered under key, so its connection
+        pool outlives callers. factory is only called to create the client on
+        first use; later callers get that client as configured.
+        """
+        with cls._shared_lock:
+            client = cls._shared.get(key)
+            if client is None:
+                client = cls._shared[key] = factory()
+            return client
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close and forget all shared clients (e.g. on shutdown)."""
+        with cls._shared_lock:
+            for client in cls._shared.values():
+                client.session.close()
+            cls._shared.clear()
+
+    def warm_up(self, timeout: float = 2.0) -> bool:
+        """
+        Open a connection to base_url ahead of the first real request.
+        Failures are ignored; returns True if the server answered.
+        """
+        try:
+            self.session.head(self.base_url, timeout=timeout)
+            return True
+        except requests.RequestException:
+            return False
+
+    def _request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        url = f"{self.base_url}{endpoint}" if self.base_url else endpoint
+        kwargs.setdefault("timeout", self.timeout)
+        if self.circuit_breaker is None:
+            return self.session.request(method, url, **kwargs)
+        try:
+            return self.circuit_breaker.call(self._send_checked, method, url, **kwargs)
+        except _ServerError as e:
+            # Counted against the breaker; callers still get the response
+            return e.response
+
+    def _send_checked(self, method: str, url: str, **kwargs) -> requests.Response:
+        # Retry does not retry POSTs on 5xx, so such responses reach the
+        # breaker and must be reported to it as failures.
+        response = self.session.request(method, url, **kwargs)
+        if response.status_code >= 500:
+            raise _ServerError(f"{response.status_code} Server Error for url: {url}", response=response)
+        return response
+
     def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
-        url =f"{self.base_url}{endpoint}" if self.base_url else endpoint
-        return self.session.get(url, params=params, **kwargs)
+        return self._request("GET", endpoint, params=params, **kwargs)
 
     def post(self, endpoint: str, json: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
-        url = f"{self.base_url}{endpoint}" if self.base_url else endpoint
-        return self.session.post(url, json=json, **kwargs)
+        return self._request("POST", endpoint, json=json, **kwargs)
 
     def put(self, endpoint: str, json: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
-        url = f"{self.base_url}{endpoint}" if self.base_url else endpoint
-        return self.session.put(url, json=json, **kwargs)
+        return self._request("PUT", endpoint, json=json, **kwargs)
 
     def delete(self, endpoint: str, **kwargs) -> requests.Response:
-        url = f"{self.base_url}{endpoint}" if self.base_url else endpoint
-        return self.session.delete(url, **kwargs)
+        return self._request("DELETE", endpoint, **kwargs)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="trackingevent",
+            constraint=models.UniqueConstraint(
+                fields=("shipment", "timestamp", "status"), name="unique_tracking_event"
+            ),
+        ),
+    ]
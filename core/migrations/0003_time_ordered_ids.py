@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:14
+
+import core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_tracking_event_unique"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="shipment",
+            name="id",
+            field=models.UUIDField(
+                default=core.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="trackingevent",
+            name="id",
+            field=models.UUIDField(
+                default=core.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_time_ordered_ids"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="shipment",
+            name="courier_provider",
+            field=models.CharField(
+                choices=[("SMSA", "SMSA"), ("ARAMEX", "ARAMEX"), ("MOCK", "MOCK")],
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="shipment",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "PENDING"),
+                    ("CREATED", "CREATED"),
+                    ("CONFIRMED", "CONFIRMED"),
+                    ("PICKED_UP", "PICKED_UP"),
+                    ("IN_TRANSIT", "IN_TRANSIT"),
+                    ("OUT_FOR_DELIVERY", "OUT_FOR_DELIVERY"),
+                    ("DELIVERED", "DELIVERED"),
+                    ("FAILED_DELIVERY", "FAILED_DELIVERY"),
+                    ("RETURNED", "RETURNED"),
+                    ("CANCELLED", "CANCELLED"),
+                    ("EXCEPTION", "EXCEPTION"),
+                    ("LOST", "LOST"),
+                    ("DAMAGED", "DAMAGED"),
+                ],
+                default="PENDING",
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="shipment",
+            name="tracking_number",
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name="shipment",
+            index=models.Index(
+                fields=["status", "-created_at"], name="ship_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="shipment",
+            index=models.Index(
+                fields=["courier_provider", "-created_at"],
+                name="ship_provider_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:17
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_dashboard_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="trackingevent",
+            name="timestamp",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_tracking_event_timestamp_default"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="shipment",
+            name="waybill_number",
+            field=models.CharField(max_length=100, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="trackingevent",
+            name="shipment",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tracking_events",
+                to="core.shipment",
+            ),
+        ),
+    ]
@@ -1,31 +1,49 @@
 """
 Core models for shipment management.
 """
+import os
+import time
 import uuid
 from django.db import models
+from django.utils import timezone
 from .enums import UnifiedStatus, CourierProvider, Priority
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7).
+    New primary keys land at the tail of the index instead of random pages.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76  # version
+    value |= ((rand >> 62) & 0xFFF) << 64  # rand_a (12 bits)
+    value |= 0b10 << 62  # variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF  # rand_b (62 bits)
+    return uuid.UUID(int=value)
+
+
 class Shipment(models.Model):
     """
     Shipment model storing all shipment data.
     Uses JSONField for flexible sender/recipient/package data.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     reference_number = models.CharField(max_length=100, db_index=True)
-    waybill_number = models.CharField(max_length=100, unique=True, db_index=True)
-    tracking_number = models.CharField(max_length=100, blank=True, db_index=True)
+    # The unique constraint is the lookup index for get-by-waybill
+    waybill_number = models.CharField(max_length=100, unique=True)
+    tracking_number = models.CharField(max_length=100, blank=True)
 
+    # Filtered through the composite indexes below
     courier_provider = models.CharField(
         max_length=50,
         choices=[(p.value, p.value) for p in CourierProvider],
-        db_index=True
     )
     status = models.CharField(
         max_length=50,
         choices=[(s.value, s.value) for s in UnifiedStatus],
         default=UnifiedStatus.PENDING.value,
-        db_index=True
     )
     priority = models.CharField(
         max_length=20,
@@ -74,21 +92,48 @@ class Shipment(models.Model):
         indexes = [
             models.Index(fields=["courier_provider", "status"]),
             models.Index(fields=["created_at"]),
+            # Dashboard listings: filter by status/provider, newest first
+            models.Index(fields=["status", "-created_at"], name="ship_status_created_idx"),
+            models.Index(fields=["courier_provider", "-created_at"], name="ship_provider_created_idx"),
         ]
 
     def __str__(self):
         return f"{self.waybill_number} ({self.courier_provider})"
 
+    def record_events(self, events) -> list:
+        """
+        Bulk-insert courier tracking events (DTOs) for this shipment.
+        Events already recorded (same timestamp and status) are skipped.
+        """
+        return TrackingEvent.objects.bulk_create(
+            [
+                TrackingEvent(
+                    shipment=self,
+                    timestamp=event.timestamp,
+                    status=event.status,
+                    raw_status=event.raw_status,
+                    description=event.description,
+                    location=event.location,
+                    details=event.details,
+                )
+                for event in events
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+
 
 class TrackingEvent(models.Model):
     """
     Individual tracking events for a shipment.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    # Indexed as the leading column of the (shipment, timestamp) index
     shipment = models.ForeignKey(
         Shipment,
         on_delete=models.CASCADE,
-        related_name="tracking_events"
+        related_name="tracking_events",
+        db_index=False,
     )
 
     status = models.CharField(
@@ -100,7 +145,7 @@ class TrackingEvent(models.Model):
     location = models.CharField(max_length=200, blank=True)
     details = models.TextField(blank=True)
 
-    timestamp = models.DateTimeField()
+    timestamp = models.DateTimeField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -108,6 +153,12 @@ class TrackingEvent(models.Model):
         indexes = [
             models.Index(fields=["shipment", "timestamp"]),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["shipment", "timestamp", "status"],
+                name="unique_tracking_event",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.shipment.waybill_number} - {self.status} at {self.timestamp}"
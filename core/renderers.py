@@ -0,0 +1,26 @@
+"""
+API renderers.
+"""
+import orjson
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# Types orjson does not handle natively (Decimal, lazy strings, ...) fall
+# back to the same conversions DRF's JSONRenderer applies. Dates and times
+# are passed through as well, so UTC datetimes keep DRF's "Z" suffix.
+_default = JSONEncoder().default
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(renderers.BaseRenderer):
+    """JSON renderer backed by orjson."""
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=_default, option=_OPTIONS)
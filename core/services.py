@@ -2,8 +2,9 @@
 Shipment Service - Business logic layer.
 """
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime
+from collections import defaultdict
+from operator import attrgetter
+from typing import Optional, Dict, Any, List
 
 from django.db import transaction
 
@@ -23,6 +24,38 @@ from .dtos import (
 
 logger = logging.getLogger(__name__)
 
+# Columns returned by get_shipment; large blobs such as label_data and
+# courier_specific_data are never loaded for the detail view.
+SHIPMENT_DETAIL_FIELDS = (
+    "id",
+    "reference_number",
+    "waybill_number",
+    "tracking_number",
+    "courier_provider",
+    "status",
+    "priority",
+    "sender_data",
+    "recipient_data",
+    "package_data",
+    "service_type",
+    "cod_amount",
+    "cost",
+    "currency",
+    "label_url",
+    "estimated_delivery_date",
+    "created_at",
+    "updated_at",
+)
+
+# Columns written on a status change; the auto_now timestamps must be listed
+# for save(update_fields=...) to refresh them.
+STATUS_UPDATE_FIELDS = ("status", "last_status_description", "last_status_update", "updated_at")
+
+# Blob columns that status mutations (track, cancel) never read
+DEFERRED_BLOB_FIELDS = ("label_data", "courier_specific_data")
+
+_event_fields = attrgetter("timestamp", "status", "description", "location")
+
 
 class ShipmentService:
     """
@@ -46,36 +79,9 @@ class ShipmentService:
             Dictionary with shipment details
         """
         # Build DTOs from data
-        sender = Address(
-            name=data["sender"]["name"],
-            address_line1=data["sender"]["address_line1"],
-            city=data["sender"]["city"],
-            country=data["sender"]["country"],
-            phone=data["sender"]["phone"],
-            postal_code=data["sender"].get("postal_code", ""),
-            address_line2=data["sender"].get("address_line2", ""),
-            email=data["sender"].get("email", ""),
-        )
-
-        recipient = Address(
-            name=data["recipient"]["name"],
-            address_line1=data["recipient"]["address_line1"],
-            city=data["recipient"]["city"],
-            country=data["recipient"]["country"],
-            phone=data["recipient"]["phone"],
-            postal_code=data["recipient"].get("postal_code", ""),
-            address_line2=data["recipient"].get("address_line2", ""),
-            email=data["recipient"].get("email", ""),
-        )
-
-        package = PackageDetails(
-            weight=data["package"]["weight"],
-            description=data["package"]["description"],
-            length=data["package"].get("length", 0),
-            width=data["package"].get("width", 0),
-            height=data["package"].get("height", 0),
-            value=data["package"].get("value", 0),
-        )
+        sender = Address.from_dict(data["sender"])
+        recipient = Address.from_dict(data["recipient"])
+        package = PackageDetails.from_dict(data["package"])
 
         request = ShipmentRequest(
             reference_number=data["reference_number"],
@@ -136,7 +142,6 @@ class ShipmentService:
         TrackingEvent.objects.create(
             shipment=shipment,
             status=UnifiedStatus.CREATED.value,
-            timestamp=datetime.now(),
             details="Shipment created in system"
         )
         
@@ -150,7 +155,9 @@ class ShipmentService:
             time.sleep(2) 
             logger.info(f"NOTIFICATION SENT for shipment {waybill}")
             
-        send_notification(shipment.waybill_number)
+        # Enqueue only once the shipment is committed, outside the transaction
+        waybill_number = shipment.waybill_number
+        transaction.on_commit(lambda: send_notification(waybill_number))
 
         logger.info(f"Shipment saved: {shipment.waybill_number}")
 
@@ -170,34 +177,61 @@ class ShipmentService:
         Track a shipment by waybill number.
         """
         try:
-            shipment = Shipment.objects.get(waybill_number=waybill_number)
+            shipment = Shipment.objects.defer(*DEFERRED_BLOB_FIELDS).get(waybill_number=waybill_number)
         except Shipment.DoesNotExist:
             raise ValueError(f"Shipment not found: {waybill_number}")
 
         courier = CourierFactory.get_courier(shipment.courier_provider)
         response: TrackingResponseDTO = courier.track_shipment(waybill_number)
 
+        return ShipmentService._record_tracking(shipment, response)
+
+    @staticmethod
+    def bulk_track(waybill_numbers: List[str]) -> List[Dict[str, Any]]:
+        """
+        Track several shipments at once.
+        Courier calls for each provider are issued concurrently.
+        """
+        shipments = {
+            shipment.waybill_number: shipment
+            for shipment in Shipment.objects.defer(*DEFERRED_BLOB_FIELDS).filter(waybill_number__in=waybill_numbers)
+        }
+        missing = [w for w in waybill_numbers if w not in shipments]
+        if missing:
+            raise ValueError(f"Shipment not found: {', '.join(missing)}")
+
+        by_provider: Dict[str, List[str]] = defaultdict(list)
+        for waybill_number in dict.fromkeys(waybill_numbers):
+            by_provider[shipments[waybill_number].courier_provider].append(waybill_number)
+
+        responses: Dict[str, TrackingResponseDTO] = {}
+        for provider, waybills in by_provider.items():
+            courier = CourierFactory.get_courier(provider)
+            responses.update(zip(waybills, courier.track_shipments_bulk(waybills)))
+
+        return [
+            ShipmentService._record_tracking(shipments[w], responses[w])
+            for w in waybill_numbers
+        ]
+
+    @staticmethod
+    def _record_tracking(shipment: Shipment, response: TrackingResponseDTO) -> Dict[str, Any]:
+        """Persist a courier tracking response and build the API payload."""
+        waybill_number = shipment.waybill_number
+
         # Update shipment status
         if response.success:
             shipment.status = response.status
             shipment.last_status_description = response.status_description
-            shipment.save()
+            shipment.save(update_fields=STATUS_UPDATE_FIELDS)
 
             # Save new tracking events
-            for event in response.events:
-                TrackingEvent.objects.get_or_create(
-                    shipment=shipment,
-                    timestamp=event.timestamp,
-                    status=event.status,
-                    defaults={
-                        "raw_status": event.raw_status,
-                        "description": event.description,
-                        "location": event.location,
-                    },
-                )
+            shipment.record_events(response.events)
 
         # Get all events from DB
-        events = shipment.tracking_events.all().order_by("timestamp")
+        events = shipment.tracking_events.only(
+            "timestamp", "status", "description", "location"
+        ).order_by("timestamp")
 
         return {
             "success": response.success,
@@ -207,12 +241,12 @@ class ShipmentService:
             "last_updated": response.last_updated.isoformat(),
             "events": [
                 {
-                    "timestamp": e.timestamp.isoformat(),
-                    "status": e.status,
-                    "description": e.description,
-                    "location": e.location,
+                    "timestamp": timestamp.isoformat(),
+                    "status": status,
+                    "description": description,
+                    "location": location,
                 }
-                for e in events
+                for timestamp, status, description, location in map(_event_fields, events)
             ],
         }
 
@@ -222,7 +256,7 @@ class ShipmentService:
         Cancel a shipment.
         """
         try:
-            shipment = Shipment.objects.get(waybill_number=waybill_number)
+            shipment = Shipment.objects.defer(*DEFERRED_BLOB_FIELDS).get(waybill_number=waybill_number)
         except Shipment.DoesNotExist:
             raise ValueError(f"Shipment not found: {waybill_number}")
 
@@ -235,14 +269,13 @@ class ShipmentService:
         if response.success:
             shipment.status = UnifiedStatus.CANCELLED.value
             shipment.last_status_description = f"Cancelled: {reason}"
-            shipment.save()
+            shipment.save(update_fields=STATUS_UPDATE_FIELDS)
 
             TrackingEvent.objects.create(
                 shipment=shipment,
                 status=UnifiedStatus.CANCELLED.value,
                 raw_status="CANCELLED",
                 description=f"Shipment cancelled. Reason: {reason or 'N/A'}",
-                timestamp=datetime.now(),
             )
 
         return {
@@ -260,29 +293,30 @@ class ShipmentService:
         Get shipment details.
         """
         try:
-            shipment = Shipment.objects.get(waybill_number=waybill_number)
+            shipment = Shipment.objects.values(*SHIPMENT_DETAIL_FIELDS).get(waybill_number=waybill_number)
         except Shipment.DoesNotExist:
             raise ValueError(f"Shipment not found: {waybill_number}")
 
+        estimated_delivery_date = shipment["estimated_delivery_date"]
         return {
-            "id": str(shipment.id),
-            "reference_number": shipment.reference_number,
-            "waybill_number": shipment.waybill_number,
-            "tracking_number": shipment.tracking_number,
-            "courier_provider": shipment.courier_provider,
-            "status": shipment.status,
-            "priority": shipment.priority,
-            "sender": shipment.sender_data,
-            "recipient": shipment.recipient_data,
-            "package": shipment.package_data,
-            "service_type": shipment.service_type,
-            "cod_amount": float(shipment.cod_amount),
-            "cost": float(shipment.cost),
-            "currency": shipment.currency,
-            "label_url": shipment.label_url,
-            "estimated_delivery_date": shipment.estimated_delivery_date.isoformat() if shipment.estimated_delivery_date else None,
-            "created_at": shipment.created_at.isoformat(),
-            "updated_at": shipment.updated_at.isoformat(),
+            "id": str(shipment["id"]),
+            "reference_number": shipment["reference_number"],
+            "waybill_number": shipment["waybill_number"],
+            "tracking_number": shipment["tracking_number"],
+            "courier_provider": shipment["courier_provider"],
+            "status": shipment["status"],
+            "priority": shipment["priority"],
+            "sender": shipment["sender_data"],
+            "recipient": shipment["recipient_data"],
+            "package": shipment["package_data"],
+            "service_type": shipment["service_type"],
+            "cod_amount": float(shipment["cod_amount"]),
+            "cost": float(shipment["cost"]),
+            "currency": shipment["currency"],
+            "label_url": shipment["label_url"],
+            "estimated_delivery_date": estimated_delivery_date.isoformat() if estimated_delivery_date else None,
+            "created_at": shipment["created_at"].isoformat(),
+            "updated_at": shipment["updated_at"].isoformat(),
         }
 
     @staticmethod
@@ -291,7 +325,9 @@ class ShipmentService:
         Get or generate shipping label.
         """
         try:
-            shipment = Shipment.objects.get(waybill_number=waybill_number)
+            shipment = Shipment.objects.only(
+                "waybill_number", "courier_provider", "label_url", "label_data"
+            ).get(waybill_number=waybill_number)
         except Shipment.DoesNotExist:
             raise ValueError(f"Shipment not found: {waybill_number}")
 
@@ -311,7 +347,7 @@ class ShipmentService:
         if response.success and response.label_url:
             shipment.label_url = response.label_url
             shipment.label_data = response.label_data
-            shipment.save()
+            shipment.save(update_fields=["label_url", "label_data", "updated_at"])
 
         return {
             "success": response.success,
@@ -1,5 +1,5 @@
+import queue
 import threading
-import time
 from typing import Callable, Any
 import logging
 
@@ -11,29 +11,35 @@ class SimpleMessageBroker:
     In a production environment, this would be replaced by Redis/Celery or RabbitMQ.
     """
     
-    def __init__(self):
-        self.queue = []
+    def __init__(self, maxsize: int = 10_000):
+        # queue.Queue is a deque guarded by a condition variable. It is bounded
+        # so a stalled worker cannot grow the backlog without limit.
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
         self._worker_thread = threading.Thread(target=self._process_queue, daemon=True)
         self._worker_thread.start()
 
     def enqueue(self, task: Callable, *args, **kwargs):
-        """Add a task to the queue."""
+        """Add a task to the queue. Tasks are dropped when the queue is full."""
         logger.info(f"Enqueuing task: {task.__name__}")
-        self.queue.append((task, args, kwargs))
+        try:
+            # Never block the caller, which may be holding a DB transaction
+            self.queue.put_nowait((task, args, kwargs))
+        except queue.Full:
+            logger.error(f"Task queue full, dropping task: {task.__name__}")
 
     def _process_queue(self):
         """Worker loop to process tasks."""
         while True:
-            if self.queue:
-                task, args, kwargs = self.queue.pop(0)
-                try:
-                    logger.info(f"Processing task: {task.__name__}")
-                    task(*args, **kwargs)
-                    logger.info(f"Task {task.__name__} completed successfully.")
-                except Exception as e:
-                    logger.error(f"Task {task.__name__} failed: {e}")
-            else:
-                time.sleep(1)
+            # Blocks until a task is available instead of polling
+            task, args, kwargs = self.queue.get()
+            try:
+                logger.info(f"Processing task: {task.__name__}")
+                task(*args, **kwargs)
+                logger.info(f"Task {task.__name__} completed successfully.")
+            except Exception as e:
+                logger.error(f"Task {task.__name__} failed: {e}")
+            finally:
+                self.queue.task_done()
 
 # Global instance
 broker = SimpleMessageBroker()
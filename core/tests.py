@@ -1,16 +1,222 @@
 """
 Unit and Integration tests for ZidShip Courier Framework.
 """
+import threading
+import time
+
+import requests
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from time import time_ns
+from unittest.mock import MagicMock, patch
 
-from .models import Shipment, TrackingEvent
+from .models import Shipment, TrackingEvent, uuid7
 from .enums import UnifiedStatus, CourierProvider
 from .couriers.factory import CourierFactory
 from .couriers.mock import MockCourier
 from .dtos import ShipmentRequest, Address, PackageDetails
+from .cache import TTLCache
+from .renderers import ORJSONRenderer
+from .http_client import CircuitBreaker, CircuitOpenError, FullJitterRetry, HTTPClient
+from .services import ShipmentService
+from .task_queue import SimpleMessageBroker
+from .views import _couriers_cache
+
+
+class UUID7Tests(TestCase):
+    def test_uuid7_is_time_ordered(self):
+        first = uuid7()
+        with patch("core.models.time.time_ns", return_value=time_ns() + 10**9):
+            second = uuid7()
+        self.assertEqual(first.version, 7)
+        self.assertLess(first, second)
+
+
+class FullJitterRetryTests(TestCase):
+    def test_backoff_is_bounded_and_jittered(self):
+        retry = FullJitterRetry(total=10, backoff_factor=1, backoff_max=4)
+        self.assertEqual(retry.get_backoff_time(), 0)
+
+        for _ in range(5):
+            retry = retry.increment(method="GET", url="/")
+        delays = {retry.get_backoff_time() for _ in range(20)}
+        self.assertTrue(all(0 <= d <= 4 for d in delays))
+        self.assertGreater(len(delays), 1)
+
+
+class HTTPClientSharedTests(TestCase):
+    def tearDown(self):
+        HTTPClient._shared.pop("test-shared", None)
+
+    def test_factory_only_runs_on_first_use(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return HTTPClient(base_url="https://example.com")
+
+        first = HTTPClient.shared("test-shared", factory)
+        second = HTTPClient.shared("test-shared", factory)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+
+
+class CircuitBreakerTests(TestCase):
+    def test_opens_after_threshold_and_recovers(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+
+        def failing():
+            raise requests.ConnectionError("down")
+
+        with patch("core.http_client.time.monotonic", return_value=100.0):
+            for _ in range(2):
+                with self.assertRaises(requests.ConnectionError):
+                    breaker.call(failing)
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+            with self.assertRaises(CircuitOpenError):
+                breaker.call(lambda: "ok")
+
+        with patch("core.http_client.time.monotonic", return_value=131.0):
+            self.assertEqual(breaker.call(lambda: "ok"), "ok")
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_unexpected_error_during_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+
+        def crashing():
+            raise RuntimeError("bug")
+
+        def failing():
+            raise requests.ConnectionError("down")
+
+        with patch("core.http_client.time.monotonic", return_value=100.0):
+            with self.assertRaises(RuntimeError):
+                breaker.call(crashing)
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+            with self.assertRaises(requests.ConnectionError):
+                breaker.call(failing)
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        with patch("core.http_client.time.monotonic", return_value=131.0):
+            with self.assertRaises(RuntimeError):
+                breaker.call(crashing)
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        with patch("core.http_client.time.monotonic", return_value=162.0):
+            self.assertEqual(breaker.call(lambda: "ok"), "ok")
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+class HTTPClientCircuitBreakerTests(TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+        self.client = HTTPClient(base_url="https://example.com", circuit_breaker=self.breaker)
+
+    def test_server_errors_open_the_circuit(self):
+        with patch.object(self.client.session, "request", return_value=MagicMock(status_code=503)):
+            for _ in range(2):
+                self.assertEqual(self.client.post("/ship").status_code, 503)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.client.post("/ship")
+
+    def test_timeouts_open_the_circuit(self):
+        with patch.object(self.client.session, "request", side_effect=requests.Timeout("slow")) as request:
+            for _ in range(2):
+                with self.assertRaises(requests.Timeout):
+                    self.client.post("/ship")
+        self.assertEqual(request.call_args.kwargs["timeout"], self.client.timeout)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+
+class TTLCacheTests(TestCase):
+    def test_entries_expire(self):
+        cache = TTLCache(ttl=10)
+        with patch("core.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value")
+            self.assertEqual(cache.get("key"), "value")
+        with patch("core.cache.time.monotonic", return_value=110.0):
+            self.assertIsNone(cache.get("key"))
+
+    def test_get_or_compute_caches_selectively(self):
+        cache = TTLCache(ttl=10)
+        calls = []
+        compute = lambda: calls.append(1) or len(calls)
+        self.assertEqual(cache.get_or_compute("a", compute), 1)
+        self.assertEqual(cache.get_or_compute("a", compute), 1)
+        self.assertEqual(cache.get_or_compute("b", compute, should_cache=lambda v: False), 2)
+        self.assertEqual(cache.get_or_compute("b", compute, should_cache=lambda v: False), 3)
+
+    def test_failed_compute_releases_key_lock(self):
+        cache = TTLCache(ttl=10)
+
+        def failing():
+            raise requests.ConnectionError("down")
+
+        for key in ("a", "b", "c"):
+            with self.assertRaises(requests.ConnectionError):
+                cache.get_or_compute(key, failing)
+        self.assertEqual(cache._key_locks, {})
+
+
+class SimpleMessageBrokerTests(TestCase):
+    def test_tasks_run_in_order_without_polling_delay(self):
+        broker = SimpleMessageBroker()
+        processed = []
+        start = time_ns()
+        for i in range(3):
+            broker.enqueue(processed.append, i)
+        broker.queue.join()
+
+        self.assertEqual(processed, [0, 1, 2])
+        self.assertLess(time_ns() - start, 500_000_000)
+
+    def test_enqueue_drops_instead_of_blocking_when_full(self):
+        broker = SimpleMessageBroker(maxsize=1)
+        release = threading.Event()
+        broker.enqueue(release.wait)
+        while broker.queue.qsize():
+            time.sleep(0.01)
+        broker.enqueue(len, "queued")
+
+        with self.assertLogs("core.task_queue", level="ERROR"):
+            broker.enqueue(len, "dropped")
+        release.set()
+        broker.queue.join()
+
+
+class DTOTests(TestCase):
+    def test_from_dict_uses_defaults_for_missing_keys(self):
+        address = Address.from_dict({
+            "name": "Ali", "address_line1": "St 1", "city": "Riyadh",
+            "country": "SA", "phone": "0500000000", "unknown": "ignored",
+        })
+        package = PackageDetails.from_dict({"weight": 1.5, "description": "Box", "length": 10})
+
+        self.assertEqual(address.email, "")
+        self.assertEqual(address.city, "Riyadh")
+        self.assertEqual((package.length, package.width, package.pieces), (10, 0.0, 1))
+
+
+class ORJSONRendererTests(TestCase):
+    def test_renders_types_outside_orjson(self):
+        rendered = ORJSONRenderer().render({
+            "cost": Decimal("12.50"),
+            "when": datetime(2024, 1, 2),
+            "at": datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=dt_timezone.utc),
+        })
+        self.assertEqual(
+            rendered,
+            b'{"cost":12.5,"when":"2024-01-02T00:00:00","at":"2024-01-02T03:04:05.123456Z"}',
+        )
+        self.assertEqual(ORJSONRenderer().render(None), b"")
 
 
 class CourierFactoryTests(TestCase):
@@ -32,6 +238,12 @@ class CourierFactoryTests(TestCase):
         self.assertIn(provider, ["MOCK", "SMSA"])
 
 
+    def test_supports_feature(self):
+        self.assertTrue(CourierFactory.supports_feature("mock", "cancellation"))
+        self.assertFalse(CourierFactory.supports_feature("MOCK", "teleportation"))
+        self.assertFalse(CourierFactory.supports_feature("INVALID", "cancellation"))
+
+
 class MockCourierTests(TestCase):
     def setUp(self):
         self.courier = MockCourier({"mock": True})
@@ -52,6 +264,16 @@ class MockCourierTests(TestCase):
         self.assertIsNotNone(response.waybill_number)
         self.assertIn("MOCK", response.waybill_number)
 
+    def test_create_shipment_validation_errors(self):
+        self.request.sender.city = ""
+        self.request.package.weight = 0
+        response = self.courier.create_shipment(self.request)
+        self.assertFalse(response.success)
+        self.assertEqual(
+            response.errors,
+            ["Sender city is required", "Package weight must be greater than 0"],
+        )
+
     def test_track_shipment_new(self):
         # Create first
         create_res = self.courier.create_shipment(self.request)
@@ -61,6 +283,21 @@ class MockCourierTests(TestCase):
         self.assertTrue(track_res.success)
         self.assertEqual(track_res.status, UnifiedStatus.CREATED.value)
 
+    def test_shipment_store_is_bounded(self):
+        with patch("core.couriers.mock.MAX_MOCK_SHIPMENTS", 2), \
+                patch.object(MockCourier, "_shipments", OrderedDict()):
+            first = self.courier.create_shipment(self.request).waybill_number
+            second = self.courier.create_shipment(self.request).waybill_number
+            self.courier.track_shipment(first)  # mark as recently used
+            self.courier.create_shipment(self.request)
+
+            self.assertIn(first, MockCourier._shipments)
+            self.assertNotIn(second, MockCourier._shipments)
+
+    def test_map_status(self):
+        self.assertEqual(self.courier.map_status("delivered"), UnifiedStatus.DELIVERED)
+        self.assertEqual(self.courier.map_status("NOT_A_STATUS"), UnifiedStatus.EXCEPTION)
+
 
 class APITests(TestCase):
     def setUp(self):
@@ -99,6 +336,19 @@ class APITests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["status"], "healthy")
 
+    def test_list_couriers_is_cached(self):
+        _couriers_cache.clear()
+
+        response = self.client.get("/api/v1/couriers/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [c["provider"] for c in response.data],
+            CourierFactory.get_available_providers(),
+        )
+        with patch.object(CourierFactory, "get_courier") as get_courier:
+            self.client.get("/api/v1/couriers/")
+        get_courier.assert_not_called()
+
     def test_create_shipment_api(self):
         response = self.client.post(
             "/api/v1/shipments/",
@@ -114,6 +364,26 @@ class APITests(TestCase):
         self.assertEqual(shipment.reference_number, "ORDER-001")
         self.assertEqual(shipment.status, UnifiedStatus.CREATED.value)
 
+    def test_get_shipment_api(self):
+        create_res = self.client.post("/api/v1/shipments/", self.valid_payload, format="json")
+        waybill = create_res.data["waybill_number"]
+
+        response = self.client.get(f"/api/v1/shipments/{waybill}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["waybill_number"], waybill)
+        self.assertEqual(response.data["sender"]["city"], "Riyadh")
+        self.assertEqual(response.data["cost"], 50.0)
+
+    def test_print_label_api(self):
+        create_res = self.client.post("/api/v1/shipments/", self.valid_payload, format="json")
+        waybill = create_res.data["waybill_number"]
+
+        response = self.client.get(f"/api/v1/shipments/{waybill}/label/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["label_url"].endswith(f"{waybill}.pdf"))
+
     def test_track_shipment_api(self):
         # Create first
         create_res = self.client.post(
@@ -128,6 +398,41 @@ class APITests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(response.data["success"])
 
+    def test_track_shipment_does_not_duplicate_events(self):
+        create_res = self.client.post("/api/v1/shipments/", self.valid_payload, format="json")
+        waybill = create_res.data["waybill_number"]
+
+        first = self.client.get(f"/api/v1/shipments/{waybill}/track/")
+        second = self.client.get(f"/api/v1/shipments/{waybill}/track/")
+
+        self.assertEqual(len(first.data["events"]), len(second.data["events"]))
+        self.assertEqual(TrackingEvent.objects.filter(shipment__waybill_number=waybill).count(), 2)
+
+    def test_track_shipment_updates_only_status_columns(self):
+        create_res = self.client.post("/api/v1/shipments/", self.valid_payload, format="json")
+        waybill = create_res.data["waybill_number"]
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(f"/api/v1/shipments/{waybill}/track/")
+
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"status"', updates[0])
+        self.assertNotIn('"label_data"', updates[0])
+
+    def test_bulk_track(self):
+        waybills = [
+            self.client.post("/api/v1/shipments/", self.valid_payload, format="json").data["waybill_number"]
+            for _ in range(2)
+        ]
+
+        results = ShipmentService.bulk_track(waybills)
+
+        self.assertEqual([r["waybill_number"] for r in results], waybills)
+        self.assertTrue(all(r["success"] for r in results))
+        with self.assertRaises(ValueError):
+            ShipmentService.bulk_track(["UNKNOWN"])
+
     def test_cancel_shipment_api(self):
         # Create first
         create_res = self.client.post(
@@ -3,7 +3,8 @@ Unit tests for SMSA Courier SOAP implementation.
 """
 from django.test import TestCase
 from unittest.mock import MagicMock, patch
-from .couriers.smsa import SMSACourier
+import xml.etree.ElementTree as ET
+from .couriers.smsa import SMSACourier, _tracking_cache
 from .dtos import ShipmentRequest, Address, PackageDetails
 from .enums import UnifiedStatus
 
@@ -15,6 +16,7 @@ class SMSACourierTests(TestCase):
             "mock_mode": False 
         }
         self.courier = SMSACourier(self.config)
+        _tracking_cache.clear()
         
         self.request = ShipmentRequest(
             reference_number="REF123",
@@ -54,13 +56,48 @@ class SMSACourierTests(TestCase):
         
         # Verify XML Request Content
         args, kwargs = mock_post.call_args
-        xml_sent = kwargs['data']
+        xml_sent = kwargs['data'].decode('utf-8')
         
         self.assertIn('<ns:passKey>test_key</ns:passKey>', xml_sent)
         self.assertIn('<ns:refNo>REF123</ns:refNo>', xml_sent)
         self.assertIn('<ns:cCity>Riyadh</ns:cCity>', xml_sent)
         self.assertIn('<ns:sCity>Jeddah</ns:sCity>', xml_sent)
         self.assertIn('<ns:codAmt>50.0</ns:codAmt>', xml_sent)
+        self.assertIn('<ns:shipType>DLV</ns:shipType><ns:PCs>1</ns:PCs>', xml_sent)
+        ET.fromstring(xml_sent)  # Envelope must be well-formed
+
+    @patch("core.http_client.HTTPClient.post")
+    def test_create_shipment_escapes_xml(self, mock_post):
+        """Test that user supplied values are XML-escaped in the payload."""
+        mock_post.return_value = MagicMock(status_code=200, content=b"<r><addShipPDFResult>SMSA1</addShipPDFResult></r>")
+        self.request.sender.name = "Tom & Jerry <Ltd>"
+
+        self.courier.create_shipment(self.request)
+
+        args, kwargs = mock_post.call_args
+        self.assertIsInstance(kwargs['data'], bytes)
+        self.assertIn(b'<ns:cName>Tom &amp; Jerry &lt;Ltd&gt;</ns:cName>', kwargs['data'])
+
+    @patch("core.http_client.HTTPClient.post")
+    def test_create_shipment_namespaced_result(self, mock_post):
+        """Test parsing a result element qualified with the SMSA namespace."""
+        mock_response = MagicMock()
+        mock_response.content = b"""
+        <soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+           <soap:Body>
+              <addShipPDFResponse xmlns="http://track.smsaexpress.com/secom/">
+                 <addShipPDFResult>SMSA654321</addShipPDFResult>
+              </addShipPDFResponse>
+           </soap:Body>
+        </soap:Envelope>
+        """
+        mock_response.status_code = 200
+        mock_post.return_value = mock_response
+
+        response = self.courier.create_shipment(self.request)
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.waybill_number, "SMSA654321")
 
     @patch("core.http_client.HTTPClient.post")
     def test_create_shipment_failure(self, mock_post):
@@ -98,6 +135,59 @@ class SMSACourierTests(TestCase):
         
         # Verify XML structure
         args, kwargs = mock_post.call_args
-        xml_sent = kwargs['data']
+        xml_sent = kwargs['data'].decode('utf-8')
         self.assertIn('<ns:getTrackingParams>', xml_sent)
         self.assertIn('<ns:awbNo>SMSA123</ns:awbNo>', xml_sent)
+
+    def test_map_status(self):
+        """Test exact, case-insensitive and fuzzy status mapping."""
+        self.assertEqual(self.courier.map_status("Delivered"), UnifiedStatus.DELIVERED)
+        self.assertEqual(self.courier.map_status("OUT FOR DELIVERY"), UnifiedStatus.OUT_FOR_DELIVERY)
+        self.assertEqual(self.courier.map_status("Shipment Canceled by shipper"), UnifiedStatus.CANCELLED)
+        self.assertEqual(self.courier.map_status("Unknown"), UnifiedStatus.IN_TRANSIT)
+
+    @patch("core.http_client.HTTPClient.post")
+    def test_track_shipments_bulk(self, mock_post):
+        """Test bulk tracking returns one response per waybill, in order."""
+        mock_post.return_value = MagicMock(status_code=200)
+
+        responses = self.courier.track_shipments_bulk(["SMSA1", "SMSA2", "SMSA3"])
+
+        self.assertEqual([r.waybill_number for r in responses], ["SMSA1", "SMSA2", "SMSA3"])
+        self.assertEqual(mock_post.call_count, 3)
+
+    @patch("core.http_client.HTTPClient.post")
+    def test_track_shipment_is_cached_until_cancelled(self, mock_post):
+        """Test repeated tracking is served from cache and cancel invalidates it."""
+        mock_post.return_value = MagicMock(status_code=200)
+        self.courier.track_shipment("SMSA777")
+        self.courier.track_shipment("SMSA777")
+        self.assertEqual(mock_post.call_count, 1)
+
+        mock_post.return_value = MagicMock(
+            status_code=200,
+            content=b"<r><cancelShipmentResult>Successfully Cancelled</cancelShipmentResult></r>",
+        )
+        self.assertTrue(self.courier.cancel_shipment("SMSA777").success)
+
+        mock_post.return_value = MagicMock(status_code=200)
+        self.courier.track_shipment("SMSA777")
+        self.assertEqual(mock_post.call_count, 3)
+
+    @patch("core.http_client.HTTPClient.post")
+    def test_tracking_cache_is_scoped_per_endpoint(self, mock_post):
+        """Test couriers for different endpoints don't share cached tracking."""
+        mock_post.return_value = MagicMock(status_code=200)
+        other = SMSACourier({**self.config, "base_url": "https://other.smsa.com"})
+
+        self.courier.track_shipment("SMSA777")
+        other.track_shipment("SMSA777")
+        self.assertEqual(mock_post.call_count, 2)
+
+    def test_http_client_shared_between_instances(self):
+        """Test couriers with the same endpoint and key reuse one HTTP client."""
+        other = SMSACourier(dict(self.config))
+        self.assertIs(other.http_client, self.courier.http_client)
+
+        different_key = SMSACourier({**self.config, "api_key": "other_key"})
+        self.assertIsNot(different_key.http_client, self.courier.http_client)
@@ -10,6 +10,7 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
+from .cache import TTLCache
 from .services import ShipmentService
 from .couriers.factory import CourierFactory
 from .serializers import (
@@ -27,6 +28,11 @@ from .serializers import (
 
 logger = logging.getLogger(__name__)
 
+# Courier metadata is effectively static; entries are keyed on the
+# registered providers so registering a new courier refreshes the list.
+COURIERS_CACHE_TTL = 300
+_couriers_cache = TTLCache(ttl=COURIERS_CACHE_TTL, maxsize=8)
+
 
 # --- Health Endpoints ---
 
@@ -66,7 +72,13 @@ def health_check(request, subpath=None):
 @api_view(["GET"])
 def list_couriers(request):
     """List all available courier providers."""
-    providers = CourierFactory.get_available_providers()
+    providers = tuple(CourierFactory.get_available_providers())
+    return Response(
+        _couriers_cache.get_or_compute(providers, lambda: _couriers_payload(providers))
+    )
+
+
+def _couriers_payload(providers):
     result = []
     for provider in providers:
         try:
@@ -81,7 +93,7 @@ def list_couriers(request):
                 "provider": provider,
                 "features": [],
             })
-    return Response(result)
+    return result
 
 
 @extend_schema(
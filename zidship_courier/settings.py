@@ -48,7 +48,7 @@ INSTALLED_APPS = [
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "core.renderers.ORJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
@@ -73,6 +73,7 @@ SPECTACULAR_SETTINGS = {
 SMSA_API_KEY = "mock-smsa-key"
 SMSA_BASE_URL = "https://track.smsaexpress.com/SECOM/SMSAwebService.asmx"
 SMSA_MOCK_MODE = True
+SMSA_WARM_UP = False  # Pre-open the HTTPS connection when the courier is created
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
@@ -118,6 +119,9 @@ DATABASES = {
     "default": dj_database_url.config(
         default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
         conn_max_age=600,
+        # Persistent connections are checked before reuse so a dropped
+        # Postgres session does not fail the first query of a request.
+        conn_health_checks=True,
     )
 }
 